@@ -1,101 +1,98 @@
 import streamlit as st
-import json
-import pandas as pd
-from fpdf import FPDF
-from jrp_solver import Item, JRPInstance, find_optimal_policy, generate_visuals
-
-# --- COLOR PALETTE ---
-P_NAVY = "#1d3557"
-P_BLUE = "#457b9d"
-P_LIGHT = "#a8dadc"
-P_BG = "#f1faee"
-P_RED = "#e63946"
+import io
+import ijson
+import orjson
+from jrp_solver import Item, JRPInstance, find_optimal_policy
+from jrp_theme import P_NAVY, P_BLUE, CSS, LANDING_HTML, HTML_REPORT_TEMPLATE
 
 # --- STYLING ---
 st.set_page_config(page_title="JRP Cockpit", page_icon="📦", layout="wide")
 
-st.markdown(f"""
-    <style>
-    /* Main Background */
-    .stApp {{ background-color: {P_BG}; }}
-    
-    /* Bold Titles */
-    h1, h2, h3 {{ 
-        color: {P_NAVY} !important; 
-        font-weight: 800 !important; 
-    }}
-    
-    /* FIX FOR BROWSE FILE READABILITY */
-    /* Target the text inside the uploader */
-    [data-testid="stFileUploader"] section {{
-        background-color: white !important;
-        border: 2px dashed {P_BLUE} !important;
-        border-radius: 10px;
-        color: {P_NAVY} !important;
-    }}
-    
-    /* Target the 'Browse files' button text */
-    [data-testid="stFileUploader"] button {{
-        color: white !important;
-        background-color: {P_BLUE} !important;
-        border-radius: 5px;
-    }}
-
-    /* Target the uploaded filename text */
-    [data-testid="stFileUploaderFileName"] {{
-        color: {P_NAVY} !important;
-        font-weight: bold !important;
-    }}
-
-    /* Sidebar styling */
-    [data-testid="stSidebar"] {{
-        background-color: {P_NAVY};
-    }}
-    [data-testid="stSidebar"] * {{
-        color: white !important;
-    }}
-    
-    /* Metric Card Styling */
-    div[data-testid="stMetric"] {{
-        background-color: white;
-        padding: 20px;
-        border-radius: 12px;
-        border-left: 8px solid {P_BLUE};
-        box-shadow: 4px 4px 15px rgba(0,0,0,0.05);
-    }}
-    div[data-testid="stMetricValue"] > div {{
-        color: {P_NAVY};
-        font-weight: bold;
-    }}
-    </style>
-""", unsafe_allow_html=True)
+st.markdown(CSS, unsafe_allow_html=True)
 
 # --- DOWNLOAD HELPERS ---
 def create_pdf(instance, T_star, total_cost, df):
+    # Deferred so sessions that never export don't pay for fpdf
+    from fpdf import FPDF
+
     pdf = FPDF()
     pdf.add_page()
-    pdf.set_font("Arial", 'B', 16)
-    pdf.cell(0, 10, f"Joint Replenishment Report: {instance.instance_name}", ln=True, align='C')
+    pdf.set_font("Helvetica", 'B', 16)
+    pdf.cell(0, 10, f"Joint Replenishment Report: {instance.instance_name}", new_x="LMARGIN", new_y="NEXT", align='C')
     pdf.ln(10)
     
-    pdf.set_font("Arial", 'B', 12)
-    pdf.cell(0, 10, f"System T*: {T_star:.5f}", ln=True)
-    pdf.cell(0, 10, f"Total Annual Cost: ${total_cost:.2f}", ln=True)
+    pdf.set_font("Helvetica", 'B', 12)
+    pdf.cell(0, 10, f"System T*: {T_star:.5f}", new_x="LMARGIN", new_y="NEXT")
+    pdf.cell(0, 10, f"Total Annual Cost: ${total_cost:.2f}", new_x="LMARGIN", new_y="NEXT")
     pdf.ln(5)
     
     # Detailed Table
-    pdf.set_font("Arial", 'B', 8)
-    cols = df.columns.tolist()
-    for col in cols:
-        pdf.cell(32, 10, str(col), 1)
+    # Columns share the printable width; the body uses monospace Courier for cheap font metrics
+    col_w = pdf.epw / len(df.columns)
+    pdf.set_font("Helvetica", 'B', 8)
+    for col in df.columns:
+        pdf.cell(col_w, 10, str(col), 1)
     pdf.ln()
-    
-    pdf.set_font("Arial", size=8)
-    for row in df.values:
+
+    pdf.set_font("Courier", size=8)
+    for row in df.astype(str).values.tolist():
         for val in row:
-            pdf.cell(32, 10, str(val), 1)
+            pdf.cell(col_w, 10, val, 1)
         pdf.ln()
-    return pdf.output(dest='S').encode('latin-1')
+    return bytes(pdf.output())
+
+# --- INPUT PARSING ---
+# Below this size orjson's extra memory is small, so the slower streaming parse isn't worth it.
+STREAM_PARSE_BYTES = 8 * 1024 * 1024
+HEADER_KEYS = ('instance_name', 'A', 'r')
+REQUIRED_HEADER_KEYS = {'A', 'r'}
+
+def load_instance(file_bytes: bytes):
+    if len(file_bytes) < STREAM_PARSE_BYTES:
+        data = orjson.loads(file_bytes)
+        items = [Item(i['id'], i['a'], i['D'], i['v']) for i in data['items']]
+        return JRPInstance(data.get('instance_name', 'Inventory_Batch'), data['A'], data['r'], items)
+
+    # Stop reading events at the items array; only walk the remainder if A or r comes after it.
+    # instance_name is optional, so it is picked up only if it appears before 'items'.
+    header = {}
+    events = ijson.parse(io.BytesIO(file_bytes), use_float=True)
+    for prefix, event, value in events:
+        if prefix in HEADER_KEYS:
+            header[prefix] = value
+        elif prefix == 'items':
+            break
+    if not REQUIRED_HEADER_KEYS <= header.keys():
+        header.update((key, value) for key, value in ijson.kvitems(events, '') if key in HEADER_KEYS)
+
+    # C-backend item records: only the current record is held as a dict
+    records = ijson.items(io.BytesIO(file_bytes), 'items.item', use_float=True)
+    items = [Item(i['id'], i['a'], i['D'], i['v']) for i in records]
+    return JRPInstance(header.get('instance_name', 'Inventory_Batch'), header['A'], header['r'], items)
+
+# --- CACHED COMPUTE ---
+# Keyed on the raw upload bytes so widget/tab reruns skip the solve and PDF work.
+# Bounded so distinct uploads don't pin their frames and PDFs for the life of the process.
+CACHE_MAX_ENTRIES = 16
+CACHE_TTL = "1h"
+# The solver returns full precision; exports are rounded once here.
+EXPORT_DECIMALS = {
+    "Individual Cycle (Ti)": 5,
+    "Setup Cost ($)": 2,
+    "Holding Cost ($)": 2,
+    "Total Item Cost ($)": 2
+}
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+def solve(file_bytes: bytes):
+    instance = load_instance(file_bytes)
+    T_star, total_cost, df = find_optimal_policy(instance)
+    return instance, T_star, total_cost, df, df.round(EXPORT_DECIMALS)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+def make_pdf_bytes(file_bytes: bytes):
+    instance, T_star, total_cost, _, export_df = solve(file_bytes)
+    return create_pdf(instance, T_star, total_cost, export_df)
 
 # --- SIDEBAR ---
 with st.sidebar:
@@ -110,11 +107,15 @@ st.markdown(f"<h1 style='text-align: center;'>📦 **Joint Replenishment Plannin
 
 if uploaded_file:
     # 1. Logic
-    data = json.load(uploaded_file)
-    items = [Item(i['id'], i['a'], i['D'], i['v']) for i in data['items']]
-    instance = JRPInstance(data.get('instance_name', 'Inventory_Batch'), data['A'], data['r'], items)
-    T_star, total_cost, results = find_optimal_policy(instance)
-    df = pd.DataFrame(results)
+    file_bytes = uploaded_file.getvalue()
+    try:
+        instance, T_star, total_cost, df, export_df = solve(file_bytes)
+    except KeyError as e:
+        st.error(f"⚠️ **Invalid instance file: missing key {e}.**")
+        st.stop()
+    except ValueError as e:
+        st.error(f"⚠️ **Invalid instance file: {e}**")
+        st.stop()
 
     # 2. Metrics
     st.markdown("### **System Results**")
@@ -129,48 +130,35 @@ if uploaded_file:
 
     with tab1:
         st.markdown("### **Cost Breakdown Visualization**")
-        fig = generate_visuals(results, [P_NAVY, P_BLUE, P_LIGHT])
-        st.pyplot(fig)
+        # Rendered client-side by Vega-Lite; stacked setup + holding bars per item, kept in solver (a/Dv) order
+        st.bar_chart(df.set_index("ID")[["Setup Cost ($)", "Holding Cost ($)"]], color=[P_NAVY, P_BLUE], y_label="Cost ($)", sort=False)
 
     with tab2:
         st.markdown("### **Full Item-by-Item Policy**")
-        st.dataframe(df.style.background_gradient(subset=['Total Item Cost ($)'], cmap='YlOrRd').format({
-            "Individual Cycle (Ti)": "{:.5f}",
-            "Setup Cost ($)": "${:.2f}",
-            "Holding Cost ($)": "${:.2f}",
-            "Total Item Cost ($)": "${:.2f}"
-        }), use_container_width=True)
+        # Native column config is formatted client-side; a pandas Styler would build per-cell CSS on every rerun
+        st.dataframe(df, column_config={
+            "Individual Cycle (Ti)": st.column_config.NumberColumn(format="%.5f"),
+            "Setup Cost ($)": st.column_config.NumberColumn(format="$%.2f"),
+            "Holding Cost ($)": st.column_config.NumberColumn(format="$%.2f"),
+            "Total Item Cost ($)": st.column_config.ProgressColumn(
+                format="$%.2f", min_value=0, max_value=float(df["Total Item Cost ($)"].max()))
+        }, width="stretch")
 
     with tab3:
         st.markdown("### **Download Center**")
         c1, c2, c3 = st.columns(3)
         
         # JSON Export
-        c1.download_button("📂 **Download JSON**", df.to_json(orient='records'), "jrp_results.json", "application/json")
+        c1.download_button("📂 **Download JSON**", orjson.dumps(export_df.to_dict(orient='records')), "jrp_results.json", "application/json")
         
         # HTML Export
-        html_report = f"""
-        <div style="font-family:sans-serif; padding:20px; background:{P_BG}">
-            <h1 style="color:{P_NAVY}">JRP Optimization Report</h1>
-            <p><b>Total Cost:</b> ${total_cost:.2f}</p>
-            {df.to_html(index=False)}
-        </div>
-        """
+        html_report = HTML_REPORT_TEMPLATE.format(total_cost=total_cost, table=export_df.to_html(index=False))
         c2.download_button("🌐 **Download HTML**", html_report, "jrp_report.html", "text/html")
         
-        # PDF Export
-        pdf_bytes = create_pdf(instance, T_star, total_cost, df)
-        c3.download_button("📕 **Download PDF**", pdf_bytes, "jrp_report.pdf", "application/pdf")
+        # PDF Export (deferred: only built when the button is clicked, then served from cache)
+        c3.download_button("📕 **Download PDF**", lambda: make_pdf_bytes(file_bytes), "jrp_report.pdf", "application/pdf")
 
 else:
     # Landing State
     st.info("💡 **Welcome! Please upload your JSON instance file in the sidebar to begin.**")
-    st.markdown(f"""
-    <div style="background-color:white; padding:20px; border-radius:10px; border:1px solid {P_LIGHT}">
-    <h3 style="margin-top:0">**How to use:**</h3>
-    1. Prepare a JSON file with keys: <b>A</b>, <b>r</b>, and <b>items</b>.<br>
-    2. Upload it using the sidebar on the left.<br>
-    3. View the optimal <b>T*</b> and <b>m<sub>i</sub></b> values instantly.<br>
-    4. Download your professional reports at the bottom.
-    </div>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    st.markdown(LANDING_HTML, unsafe_allow_html=True)
\ No newline at end of file
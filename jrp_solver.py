@@ -1,75 +1,78 @@
 import math
-import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     id: str
     a: float
     D: float
     v: float
-    @property
-    def a_over_Dv(self) -> float:
-        return self.a / (self.D * self.v) if self.D * self.v > 0 else float('inf')
 
-@dataclass
+@dataclass(slots=True)
 class JRPInstance:
     instance_name: str
     A: float
     r: float
     items: List[Item]
 
-def find_optimal_policy(instance: JRPInstance):
+def _solve_core(a, D, v, A, r):
+    # Numeric core on flat float64 arrays; returns the a/Dv sort order, T*, total cost and per-item arrays in that order
+    n = a.shape[0]
+
     # Sort by a/Dv
-    sorted_items = sorted(instance.items, key=lambda x: x.a_over_Dv)
-    m_values = [1] * len(sorted_items)
-    D1_v1 = sorted_items[0].D * sorted_items[0].v
-    
+    Dv = D * v
+    aDv = a / Dv
+    if np.all(aDv[1:] >= aDv[:-1]):
+        # Already sorted (e.g. a reloaded or pre-ordered catalog): O(n) check, no reindexing
+        order = np.arange(n)
+    else:
+        order = np.argsort(aDv, kind='stable')
+        a, Dv, aDv = a[order], Dv[order], aDv[order]
+
     # Calculate m_i
-    for i in range(1, len(sorted_items)):
-        ratio = (sorted_items[i].a_over_Dv) * (D1_v1 / (instance.A + sorted_items[0].a))
-        m_values[i] = max(1, round(math.sqrt(ratio)))
-    
-    # Calculate T*
-    num = 2 * (instance.A + sum(item.a / m_values[i] for i, item in enumerate(sorted_items)))
-    den = instance.r * sum(m_values[i] * item.D * item.v for i, item in enumerate(sorted_items))
+    m = np.ones(n, dtype=np.int64)
+    ratio = aDv[1:] * (Dv[0] / (A + a[0]))
+    m[1:] = np.maximum(1, np.rint(np.sqrt(ratio)).astype(np.int64))
+
+    # Calculate T* (a/m and m*Dv are reused below for the per-item costs)
+    a_m = a / m
+    mDv = m * Dv
+    num = 2 * (A + a_m.sum())
+    den = r * mDv.sum()
     T_star = math.sqrt(num / den)
-    
-    item_results = []
-    for i, item in enumerate(sorted_items):
-        ti = m_values[i] * T_star
-        h_cost = (item.D * ti * item.v * instance.r) / 2
-        s_cost = item.a / ti
-        item_results.append({
-            "ID": item.id,
-            "Multiplier (m)": m_values[i],
-            "Individual Cycle (Ti)": round(ti, 5),
-            "Setup Cost ($)": round(s_cost, 2),
-            "Holding Cost ($)": round(h_cost, 2),
-            "Total Item Cost ($)": round(s_cost + h_cost, 2)
-        })
+    # At T*, A/T + sum(a/Ti) + sum(D*Ti*v*r/2) collapses to sqrt(num * den)
+    total_cost = math.sqrt(num * den)
+
+    ti = m * T_star
+    h_cost = mDv * (T_star * r / 2)
+    s_cost = a_m / T_star
+    return order, T_star, total_cost, m, ti, s_cost, h_cost
+
+def find_optimal_policy(instance: JRPInstance):
+    # Pull item parameters into flat arrays (struct-of-arrays)
+    n = len(instance.items)
+    ids = np.array([item.id for item in instance.items], dtype=object)
+    a = np.fromiter((item.a for item in instance.items), dtype=np.float64, count=n)
+    D = np.fromiter((item.D for item in instance.items), dtype=np.float64, count=n)
+    v = np.fromiter((item.v for item in instance.items), dtype=np.float64, count=n)
 
-    total_system_cost = (instance.A / T_star) + sum(res["Total Item Cost ($)"] for res in item_results)
-    return T_star, total_system_cost, item_results
+    # a/Dv (and so m_i) is undefined unless D * v > 0
+    invalid = ~(D * v > 0)
+    if invalid.any():
+        raise ValueError(f"Items must have D * v > 0; invalid item IDs: {', '.join(map(str, ids[invalid]))}")
 
-def generate_visuals(item_results, palette):
-    # Breakdown chart using your palette
-    ids = [r["ID"] for r in item_results]
-    setups = [r["Setup Cost ($)"] for r in item_results]
-    holdings = [r["Holding Cost ($)"] for r in item_results]
+    order, T_star, total_system_cost, m, ti, s_cost, h_cost = _solve_core(a, D, v, instance.A, instance.r)
 
-    fig, ax = plt.subplots(figsize=(10, 5))
-    fig.patch.set_facecolor('#f1faee')
-    ax.set_facecolor('#f1faee')
-    
-    ax.bar(ids, setups, label='Setup Cost', color=palette[0]) # 1d3557
-    ax.bar(ids, holdings, bottom=setups, label='Holding Cost', color=palette[1]) # 457b9d
-    
-    ax.set_ylabel('Cost ($)', fontweight='bold')
-    ax.set_title('Cost Breakdown per Item', fontweight='bold', fontsize=14)
-    ax.legend()
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    return fig
\ No newline at end of file
+    # Full precision; rounding is left to display/export
+    item_results = pd.DataFrame({
+        "ID": ids[order],
+        "Multiplier (m)": m,
+        "Individual Cycle (Ti)": ti,
+        "Setup Cost ($)": s_cost,
+        "Holding Cost ($)": h_cost,
+        "Total Item Cost ($)": s_cost + h_cost
+    })
+    return T_star, total_system_cost, item_results
\ No newline at end of file
@@ -0,0 +1,88 @@
+# Palette and HTML/CSS templates for the cockpit UI.
+# Kept out of app.py because Streamlit re-executes the app script on every rerun;
+# an imported module is evaluated once per process, so these strings are built once.
+
+# --- COLOR PALETTE ---
+P_NAVY = "#1d3557"
+P_BLUE = "#457b9d"
+P_LIGHT = "#a8dadc"
+P_BG = "#f1faee"
+P_RED = "#e63946"
+
+# --- STYLING ---
+CSS = f"""
+    <style>
+    /* Main Background */
+    .stApp {{ background-color: {P_BG}; }}
+    
+    /* Bold Titles */
+    h1, h2, h3 {{ 
+        color: {P_NAVY} !important; 
+        font-weight: 800 !important; 
+    }}
+    
+    /* FIX FOR BROWSE FILE READABILITY */
+    /* Target the text inside the uploader */
+    [data-testid="stFileUploader"] section {{
+        background-color: white !important;
+        border: 2px dashed {P_BLUE} !important;
+        border-radius: 10px;
+        color: {P_NAVY} !important;
+    }}
+    
+    /* Target the 'Browse files' button text */
+    [data-testid="stFileUploader"] button {{
+        color: white !important;
+        background-color: {P_BLUE} !important;
+        border-radius: 5px;
+    }}
+
+    /* Target the uploaded filename text */
+    [data-testid="stFileUploaderFileName"] {{
+        color: {P_NAVY} !important;
+        font-weight: bold !important;
+    }}
+
+    /* Sidebar styling */
+    [data-testid="stSidebar"] {{
+        background-color: {P_NAVY};
+    }}
+    [data-testid="stSidebar"] * {{
+        color: white !important;
+    }}
+    
+    /* Metric Card Styling */
+    div[data-testid="stMetric"] {{
+        background-color: white;
+        padding: 20px;
+        border-radius: 12px;
+        border-left: 8px solid {P_BLUE};
+        box-shadow: 4px 4px 15px rgba(0,0,0,0.05);
+    }}
+    div[data-testid="stMetricValue"] > div {{
+        color: {P_NAVY};
+        font-weight: bold;
+    }}
+    </style>
+"""
+
+# --- LANDING PAGE ---
+LANDING_HTML = f"""
+    <div style="background-color:white; padding:20px; border-radius:10px; border:1px solid {P_LIGHT}">
+    <h3 style="margin-top:0">**How to use:**</h3>
+    1. Prepare a JSON file with keys: <b>A</b>, <b>r</b>, and <b>items</b>.<br>
+    2. Upload it using the sidebar on the left.<br>
+    3. View the optimal <b>T*</b> and <b>m<sub>i</sub></b> values instantly.<br>
+    4. Download your professional reports at the bottom.
+    </div>
+    """
+
+# --- HTML EXPORT ---
+# Palette is filled in here; call .format(total_cost=..., table=...) per report.
+HTML_REPORT_TEMPLATE = f"""
+<div style="font-family:sans-serif; padding:20px; background:{P_BG}">
+    <h1 style="color:{P_NAVY}">JRP Optimization Report</h1>
+    <p><b>Total Cost:</b> ${{total_cost:.2f}}</p>
+    {{table}}
+</div>
+"""